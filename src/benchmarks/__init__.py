@@ -0,0 +1 @@
+"""Benchmarks for the storyteller runtime. Run them from the src folder, e.g. python -m benchmarks.workers"""
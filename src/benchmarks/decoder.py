@@ -0,0 +1,89 @@
+"""
+Compares WorldDecoder (schema checks + conversion) with a bare json.load.
+
+Every measurement runs in a fresh process with the default garbage collector
+settings, so neither side pays for (or skips) scanning the heap of the other.
+
+Usage (from the src folder):
+    python -m benchmarks.decoder --rooms 100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from storywriter import GameBuilder, TextReader
+from storyteller.decoder import WorldDecoder
+from .world_gen import generate_world
+
+
+def _bare(filename: str):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def _decoded(filename: str):
+    with open(filename) as f:
+        return WorldDecoder(TextReader()).decode(f)
+
+
+LOADERS = {"bare": _bare, "decoder": _decoded}
+
+
+def _measure(loader: str, filename: str, repeat: int):
+    """Times a loader in this process and prints the fastest run as JSON."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        world = LOADERS[loader](filename)
+        best = min(best, time.perf_counter() - start)
+        # Drop the previous world before the next run, so every run starts from the same heap
+        del world
+        gc.collect()
+    print(json.dumps({"seconds": best}))
+
+
+def _run(loader: str, filename: str, repeat: int) -> float:
+    """Times a loader in a fresh process."""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.decoder", "--measure", loader, filename, "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--measure", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(*args.measure, args.repeat)
+        return
+
+    print(f"World: {args.rooms} rooms")
+    print(f"{'format':>10} {'json.load s':>12} {'decoder s':>10} {'ratio':>7}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        filenames = {}
+        game_data = generate_world(args.rooms)
+        for label, compress in (("plain", False), ("text store", True)):
+            filenames[label] = os.path.join(folder, f"{label.replace(' ', '_')}.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                GameBuilder.save_game(game_data, filenames[label], compress_text=compress)
+        del game_data
+
+        for label, filename in filenames.items():
+            bare_time = _run("bare", filename, args.repeat)
+            decoder_time = _run("decoder", filename, args.repeat)
+            print(f"{label:>10} {bare_time:>12.3f} {decoder_time:>10.3f} {decoder_time / bare_time:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Reports the memory used by a loaded world and by game sessions.
+
+Loads a generated world, then runs several sessions on a shared copy of it,
+printing memory_report() figures and the tracemalloc growth per subsystem.
+With --max-session-kb the run fails when a session grows past the budget,
+so memory regressions break the benchmark run.
+
+Usage (from the src folder):
+    python -m benchmarks.memory --rooms 10000 --sessions 100 --commands 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from storywriter import GameBuilder
+from storyteller import GameEngine, SharedWorld, memory_report, MemoryTracker
+from .world_gen import generate_world, generate_script
+
+
+def _print_table(title: str, usage: dict):
+    print(f"\n{title}")
+    for part, size in usage.items():
+        print(f"  {part:<16} {size / 1024:>12.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--compress-text", action="store_true")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="only report object sizes")
+    parser.add_argument("--max-session-kb", type=float, help="fail if a session uses more than this")
+    args = parser.parse_args()
+
+    tracker = MemoryTracker()
+    if not args.no_tracemalloc:
+        tracker.start()
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "world.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            GameBuilder.save_game(generate_world(args.rooms), filename, compress_text=args.compress_text)
+
+        before_load = tracker.snapshot() if not args.no_tracemalloc else {}
+        engine = GameEngine()
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.load_game(filename)
+        after_load = tracker.snapshot() if not args.no_tracemalloc else {}
+
+        world = SharedWorld.from_file(filename)
+
+    try:
+        sessions = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in range(args.sessions):
+                session = GameEngine()
+                session.attach_world(world)
+                for command in generate_script(args.commands, seed=n):
+                    session.execute(command)
+                sessions.append(session)
+        after_sessions = tracker.snapshot() if not args.no_tracemalloc else {}
+
+        loaded = memory_report([engine])
+        shared = memory_report(sessions)
+        session_totals = [s["total"] for s in shared["sessions"]]
+
+        print(f"World: {args.rooms} rooms, {args.sessions} sessions x {args.commands} commands")
+        _print_table("Loaded world (load_game)", loaded["world"])
+        _print_table("Loaded world session (its own index)", loaded["sessions"][0])
+        _print_table("Shared world (all sessions)", shared["world"])
+        _print_table("Sessions", {
+            "mean": sum(session_totals) / len(session_totals),
+            "max": max(session_totals),
+            "all": sum(session_totals),
+        })
+        if not args.no_tracemalloc:
+            _print_table("tracemalloc growth: load_game", MemoryTracker.diff(before_load, after_load))
+            _print_table("tracemalloc growth: sessions", MemoryTracker.diff(after_load, after_sessions))
+    finally:
+        tracker.stop()
+        world.unlink()
+
+    if args.max_session_kb is not None and max(session_totals) / 1024 > args.max_session_kb:
+        print(f"\nFAIL: a session uses {max(session_totals) / 1024:.1f} KB (budget {args.max_session_kb} KB)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares plain JSON worlds with worlds using the compressed text store.
+
+Reports file size, load time and resident memory after load. Each load runs
+in a fresh process so the memory numbers do not mix.
+
+Usage (from the src folder):
+    python -m benchmarks.text_store --rooms 100000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from storywriter import GameBuilder
+from .world_gen import generate_world
+
+
+def _rss_mb() -> float:
+    """Current resident memory of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        # Not Linux: fall back to the peak (ru_maxrss is in KB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _load(filename: str):
+    """Loads a world in this process and prints the measurements as JSON."""
+    from storyteller import GameEngine
+
+    rss_before = _rss_mb()
+    engine = GameEngine()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.load_game(filename)
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_mb()
+
+    # Touch one description to make sure the lazy path works
+    str(engine.game_map[engine.player.current_room_id]['description'])
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_after - rss_before}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--load", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        _load(args.load)
+        return
+
+    game_data = generate_world(args.rooms)
+    print(f"World: {args.rooms} rooms")
+    print(f"{'format':>10} {'file MB':>10} {'load s':>10} {'RSS MB':>10}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for label in ("plain", "compact", "text store"):
+            filename = os.path.join(folder, f"{label.replace(' ', '_')}.json")
+            if label == "compact":
+                # Plain JSON without indentation, for a fair comparison with the packed world
+                with open(filename, 'w') as f:
+                    json.dump(game_data.to_dict(), f)
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    GameBuilder.save_game(game_data, filename, compress_text=label == "text store")
+
+            result = subprocess.run([sys.executable, "-m", "benchmarks.text_store", "--load", filename],
+                                    capture_output=True, text=True, check=True)
+            measured = json.loads(result.stdout)
+            size = os.path.getsize(filename) / 1e6
+            print(f"{label:>10} {size:>10.1f} {measured['seconds']:>10.3f} {measured['rss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Measures session throughput of SessionSupervisor against the number of workers.
+
+Usage (from the src folder):
+    python -m benchmarks.workers --rooms 10000 --sessions 200 --commands 50
+"""
+import argparse
+import multiprocessing
+import time
+from storyteller import SharedWorld, SessionSupervisor
+from .world_gen import generate_world, generate_script
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    world = SharedWorld.create(generate_world(args.rooms).to_dict())
+    scripts = {f"session_{n}": generate_script(args.commands, seed=n) for n in range(args.sessions)}
+    total_commands = args.sessions * args.commands
+
+    print(f"World: {args.rooms} rooms, {world.size / 1e6:.1f} MB shared")
+    print(f"{'workers':>8} {'seconds':>10} {'commands/s':>12} {'speedup':>8}")
+
+    baseline = None
+    workers = 1
+    try:
+        while workers <= args.max_workers:
+            with SessionSupervisor(world, workers) as supervisor:
+                start = time.perf_counter()
+                supervisor.run_sessions(scripts)
+                elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {total_commands / elapsed:>12.0f} {baseline / elapsed:>7.2f}x")
+            workers *= 2
+    finally:
+        world.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Generates large, repetitive game worlds for the benchmarks."""
+import random
+from storywriter import GameData, Room, Item, NPC, Event
+
+# Generated worlds reuse a small pool of prose, like real procedurally built maps do
+_DESCRIPTIONS = [
+    "A narrow corridor of damp stone. Water drips somewhere in the dark.",
+    "A quiet clearing surrounded by tall pines. Birds sing in the branches.",
+    "The ruins of an old watchtower. Broken arrows litter the floor.",
+    "A dusty library. Rotten shelves lean against each other.",
+    "A cold cave. Your footsteps echo far into the mountain.",
+]
+_ITEMS = [
+    ("Rusty Key", "An old iron key, covered in rust."),
+    ("Torch", "A wooden torch wrapped in oily cloth."),
+    ("Gold Coin", "A single gold coin."),
+    ("Healing Herb", "A bitter green herb that closes small wounds."),
+]
+_LINES = [
+    "Hello, traveler. The ruins are dangerous.",
+    "Only the bravest seek the Sunstone Key.",
+    "Mind the stairs, they are older than me.",
+]
+
+
+def generate_world(num_rooms: int, seed: int = 0) -> GameData:
+    """
+    Builds a square grid of rooms connected north/south/east/west.
+
+    Every room gets a few items; some rooms also get an NPC, an inscription or a locked chest.
+
+    Args:
+        num_rooms: How many rooms to create.
+        seed: Seed for the random generator, so runs are repeatable.
+
+    Returns:
+        The generated GameData.
+    """
+    rng = random.Random(seed)
+    width = max(1, int(num_rooms ** 0.5))
+    game_data = GameData(start_room_id="room_0")
+
+    for n in range(num_rooms):
+        room_id = f"room_{n}"
+        room = Room(f"Room {n}", rng.choice(_DESCRIPTIONS), room_id)
+
+        if n % width > 0:
+            room.add_exit("west", f"room_{n - 1}")
+        if n % width < width - 1 and n + 1 < num_rooms:
+            room.add_exit("east", f"room_{n + 1}")
+        if n >= width:
+            room.add_exit("north", f"room_{n - width}")
+        if n + width < num_rooms:
+            room.add_exit("south", f"room_{n + width}")
+
+        for name, description in rng.sample(_ITEMS, 2):
+            room.add_item(Item(name, description))
+
+        if n % 7 == 0:
+            event_id = f"chat_{n}"
+            game_data.add_event(Event(event_id, "dialogue", {
+                "speaker": f"Villager {n}",
+                "lines": rng.sample(_LINES, 2)
+            }))
+            room.add_npc(NPC(f"Villager {n}", dialogue_id=event_id))
+        if n % 11 == 0:
+            event_id = f"sign_{n}"
+            game_data.add_event(Event(event_id, "read", {"text": "The past is a lock, the present is the key."}))
+            room.add_interactive_object("sign", event_id)
+        if n % 13 == 0:
+            event_id = f"chest_{n}"
+            game_data.add_event(Event(event_id, "chest", {
+                "key_name": "Rusty Key",
+                "items": [Item("Ancient Sword", "A magnificent sword, still sharp.").to_dict()]
+            }))
+            room.add_interactive_object("chest", event_id)
+
+        game_data.add_room(room)
+
+    return game_data
+
+
+def generate_script(num_commands: int, seed: int = 0) -> list:
+    """Generates a random list of player commands for one session."""
+    rng = random.Random(seed)
+    verbs = ["go north", "go south", "go east", "go west", "look", "take torch",
+             "take rusty key", "open chest", "read sign", "inventory"]
+    return [rng.choice(verbs) for _ in range(num_commands)]
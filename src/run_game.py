@@ -1,10 +1,40 @@
+import argparse
+import sys
+from contextlib import redirect_stdout
 from storyteller import GameEngine
 from settings import *
 
+def positive_int(value: str) -> int:
+    """argparse type accepting integers of 1 or more."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Play a text adventure.")
+    parser.add_argument("game", nargs="?", default=GAMES_FOLDER+"my_adventure.json",
+                        help="path to the game file")
+    parser.add_argument("--pipe", action="store_true",
+                        help="read commands from stdin without prompts (for command files)")
+    parser.add_argument("--json", action="store_true",
+                        help="in pipe mode, write one JSON result per command (implies --pipe)")
+    parser.add_argument("--block-size", type=positive_int, default=256,
+                        help="in pipe mode, commands read and flushed together")
+    args = parser.parse_args()
+
     # Initialize game engine
     engine = GameEngine()
-    
+
+    if args.pipe or args.json:
+        # Keep loading messages out of the piped output
+        with redirect_stdout(sys.stderr):
+            loaded = engine.load_game(args.game)
+        if loaded:
+            engine.run_pipe(sys.stdin, sys.stdout, args.block_size, args.json)
     # Load game and run it
-    if engine.load_game(GAMES_FOLDER+"my_adventure.json"):
+    elif engine.load_game(args.game):
         engine.run()
\ No newline at end of file
@@ -1,4 +1,7 @@
 """Initialization for the game_engine package."""
 from .engine import GameEngine
+from .shared_world import SharedWorld
+from .workers import SessionSupervisor
+from .memory import memory_report, MemoryTracker
 
-__all__ = ['GameEngine']
\ No newline at end of file
+__all__ = ['GameEngine', 'SharedWorld', 'SessionSupervisor', 'memory_report', 'MemoryTracker']
\ No newline at end of file
@@ -4,6 +4,7 @@ Implements the Command Pattern for processing user input.
 This file defines the base command class and the router that dispatches commands.
 """
 from typing import Dict, Any, List
+from storywriter.index import WorldIndex
 from .player import Player
 
 # --- BASE COMMAND CLASS ---
@@ -13,11 +14,13 @@ class BaseCommand:
     
     VERB: List[str] = [] # The keywords that trigger this command (e.g., ['go', 'move'])
     
-    def __init__(self, player: Player, game_map: Dict[str, Any], all_events: Dict[str, Any]):
-        """Initializes the command with access to game state."""
+    def __init__(self, player: Player, game_map: Dict[str, Any], all_events: Dict[str, Any],
+                 index: WorldIndex = None):
+        """Initializes the command with access to game state (the index is optional)."""
         self.player = player
         self.game_map = game_map
         self.all_events = all_events
+        self.index = index
         self.current_room_data = game_map[player.current_room_id]
 
     def execute(self, noun: str) -> bool:
@@ -48,6 +51,10 @@ class BaseCommand:
                 print(f"  > {line}")
             print("---------------------------------")
 
+        elif event_type == "dialogue_tree":
+            print(f"\n--- Conversation with {data.get('speaker', 'Stranger')} ---")
+            self._show_dialogue_node(event_data, 0)
+
         elif event_type == "read":
             print("\nYou read:")
             print(f"  *** {data.get('text', 'The text is too faded to read.')} ***")
@@ -62,11 +69,37 @@ class BaseCommand:
             print("The chest opens with a deep thud.")
             for item in data.get('items', []):
                 self.player.take_item(item)
+            if self.index is not None:
+                self.index.open_chest(event_data, self.player.current_room_id)
             # TODO: Add logic to remove the chest from the room after opening.
             
         else:
             print(f"System Error: Unknown event type '{event_type}'.")
 
+    def _show_dialogue_node(self, event_data: Dict[str, Any], node: int):
+        """
+        Prints a dialogue tree node with its numbered answers and remembers where the player is.
+
+        Args:
+            event_data: The dictionary representation of the dialogue tree Event.
+            node: The index of the node to show.
+        """
+        data = event_data['data']
+        offsets = data['choice_offsets']
+        print(f"  > {data['text'][node]}")
+
+        first, last = offsets[node], offsets[node + 1]
+        if first == last:
+            # A node without answers ends the conversation
+            self.player.conversation = None
+            print("---------------------------------")
+            return
+
+        for number, label in enumerate(data['choice_labels'][first:last], start=1):
+            print(f"    {number}. {label}")
+        print("(Type 'talk <number>' to answer.)")
+        self.player.conversation = (event_data['event_id'], node)
+
 
 # --- SPECIFIC COMMAND IMPLEMENTATIONS ---
 
@@ -77,6 +110,7 @@ class GoCommand(BaseCommand):
     def execute(self, noun: str) -> bool:
         if noun in self.current_room_data['exits']:
             self.player.current_room_id = self.current_room_data['exits'][noun]
+            self.player.conversation = None # Walking away ends any conversation
             # Print room description upon moving is now handled by the Engine loop
             print(f"You move {noun}...")
         else:
@@ -96,6 +130,8 @@ class TakeCommand(BaseCommand):
                 # Remove from room and add to player
                 self.current_room_data['items'].remove(item_to_take)
                 self.player.take_item(item_to_take)
+                if self.index is not None:
+                    self.index.remove('item', item_to_take['name'], self.player.current_room_id)
             else:
                 print(f"The {item_to_take['name']} is too heavy or fixed in place.")
         else:
@@ -103,10 +139,14 @@ class TakeCommand(BaseCommand):
         return True
 
 class TalkCommand(BaseCommand):
-    """Handles talking to NPCs."""
+    """Handles talking to NPCs and answering them in a conversation ('talk 2')."""
     VERB = ['talk']
 
     def execute(self, noun: str) -> bool:
+        if self.player.conversation and noun.isdecimal():
+            self._answer(int(noun))
+            return True
+
         target_npc = next((n for n in self.current_room_data['npcs'] if n['name'].lower() == noun), None)
         
         if target_npc:
@@ -119,6 +159,18 @@ class TalkCommand(BaseCommand):
         else:
             print("Talk to whom?")
         return True
+
+    def _answer(self, number: int):
+        """Follows the chosen answer of the current dialogue tree node."""
+        event_id, node = self.player.conversation
+        event_data = self.all_events[event_id]
+        data = event_data['data']
+        first, last = data['choice_offsets'][node], data['choice_offsets'][node + 1]
+
+        if not 1 <= number <= last - first:
+            print(f"Choose an answer between 1 and {last - first}.")
+            return
+        self._show_dialogue_node(event_data, data['choice_targets'][first + number - 1])
     
 class OpenCommand(BaseCommand):
     """Handles opening interactive objects like chests."""
@@ -209,7 +261,8 @@ class CommandProcessor:
             _VERB_MAP[verb] = cmd_class
 
     @staticmethod
-    def process(command_input: str, player: Player, game_map: Dict[str, Any], all_events: Dict[str, Any]) -> bool:
+    def process(command_input: str, player: Player, game_map: Dict[str, Any], all_events: Dict[str, Any],
+                index: WorldIndex = None) -> bool:
         """
         Parses input and executes the relevant command class.
 
@@ -218,6 +271,7 @@ class CommandProcessor:
             player: The runtime Player object.
             game_map: The current game map data.
             all_events: A dictionary of all global events.
+            index: The world index to keep up to date (optional).
 
         Returns:
             True if the game should continue, False if the game should quit.
@@ -233,7 +287,7 @@ class CommandProcessor:
         
         if command_class:
             # Instantiate the command object and execute it
-            command_instance = command_class(player, game_map, all_events)
+            command_instance = command_class(player, game_map, all_events, index)
             return command_instance.execute(noun)
         else:
             print(f"I don't understand that command: '{command_input}'.")
@@ -0,0 +1,395 @@
+"""
+Checks and decodes a game world file in a single pass.
+
+The world schema is compiled once, at import time, into small checking
+functions. WorldDecoder parses the file with the C JSON parser, turning prose
+references into shared TextRefs as they are parsed, and then walks the result
+exactly once to type-check every value; a last cheap pass checks that the
+start room and every exit lead to existing rooms. Every problem is collected together
+with its JSON path (e.g. "$.rooms.LOC2.items[0].name"), so a broken world
+reports all of its errors at once instead of failing later inside a command.
+"""
+import json
+from array import array
+from typing import Dict, Any, Callable, List, Set, Tuple, IO
+from storywriter.text_store import TextReader, TextRef
+
+# A path is a linked list of (parent, key) tuples, formatted only when an error is reported
+Path = Tuple[Any, Any]
+Check = Callable[[Any, Path, List[str], TextReader], Any]
+
+_TYPE_NAMES = {str: "a string", int: "an integer", bool: "a boolean", list: "a list",
+               dict: "an object", type(None): "null"}
+
+
+def format_path(path: Path) -> str:
+    """Formats a path as a JSON path string, e.g. $.rooms.LOC1.items[0]."""
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "$" + "".join(reversed(parts))
+
+
+def _describe(types: tuple) -> str:
+    return " or ".join(_TYPE_NAMES[t] for t in types)
+
+
+def _type_error(types: tuple, value: Any, path: Path, errors: List[str]):
+    errors.append(f"{format_path(path)}: expected {_describe(types)}, got {type(value).__name__}")
+
+
+# --- SCHEMA COMBINATORS ---
+# A field spec is either a tuple of accepted types (checked inline, nothing to convert),
+# _text (checked inline too) or a Check function that validates and returns the converted value.
+
+class _Missing:
+    """Type of _MISSING, the value of absent keys while checking a record."""
+
+
+_MISSING = _Missing()
+
+
+def _text(value: Any, path: Path, errors: List[str], text: TextReader) -> Any:
+    """Prose: a plain string or a text store reference like {"$text": 12} (or its TextRef)."""
+    if type(value) is str:
+        return value
+    if type(value) is TextRef:
+        # Converted while parsing; WorldDecoder checks the range of all references at once
+        return value
+    if type(value) is dict and len(value) == 1 and type(value.get("$text")) is int:
+        if not 0 <= value["$text"] < text.count:
+            errors.append(f"{format_path(path)}: text reference {value['$text']} is not in the text store")
+            return value
+        return text.ref(value["$text"])
+    errors.append(f"{format_path(path)}: expected a string or a text reference, got {type(value).__name__}")
+    return value
+
+
+def _inline(spec) -> Tuple[tuple, Check]:
+    """
+    Splits a spec into (types accepted inline, fallback check for anything else).
+
+    Returns ((), spec) for specs that always need their check function.
+    """
+    if isinstance(spec, tuple):
+        return spec, None
+    if spec is _text:
+        # Most prose is a string or an already converted reference
+        return (str, TextRef), _text
+    return (), spec
+
+
+def _int_array(value: Any, path: Path, errors: List[str], text: TextReader) -> Any:
+    """A list of integers, stored at runtime as a compact array."""
+    if type(value) is not list:
+        _type_error((list,), value, path, errors)
+        return value
+    try:
+        # bools are ints to array(), so reject them explicitly
+        if any(type(element) is bool for element in value):
+            raise TypeError
+        return array('l', value)
+    except (TypeError, OverflowError):
+        # Slow path, only to report which elements are wrong
+        for position, element in enumerate(value):
+            if type(element) is not int:
+                _type_error((int,), element, (path, position), errors)
+        return value
+
+
+def _list_of(spec) -> Check:
+    """Compiles a check for a list whose elements all match spec."""
+    types, element_check = _inline(spec)
+
+    def check(value, path, errors, text):
+        if type(value) is not list:
+            _type_error((list,), value, path, errors)
+            return value
+        if types:
+            # Usual case: every element passes its type test, so nothing needs a path or a call
+            for element in value:
+                if type(element) not in types:
+                    break
+            else:
+                return value
+        for position, element in enumerate(value):
+            if type(element) in types:
+                continue
+            if element_check is None:
+                _type_error(types, element, (path, position), errors)
+            else:
+                converted = element_check(element, (path, position), errors, text)
+                if converted is not element:
+                    value[position] = converted
+        return value
+    check.container = list
+    return check
+
+
+def _dict_of(spec) -> Check:
+    """Compiles a check for an object with arbitrary keys and values matching spec."""
+    types, element_check = _inline(spec)
+
+    def check(value, path, errors, text):
+        if type(value) is not dict:
+            _type_error((dict,), value, path, errors)
+            return value
+        if types:
+            # Usual case: every element passes its type test, so nothing needs a path or a call
+            for element in value.values():
+                if type(element) not in types:
+                    break
+            else:
+                return value
+        for key, element in value.items():
+            if type(element) in types:
+                continue
+            if element_check is None:
+                _type_error(types, element, (path, key), errors)
+            else:
+                converted = element_check(element, (path, key), errors, text)
+                if converted is not element:
+                    value[key] = converted
+        return value
+    check.container = dict
+    return check
+
+
+def _field_error(value: dict, key: str, element: Any, types: tuple, field_check: Check, is_required: bool,
+                 path: Path, errors: List[str], text: TextReader):
+    """Slow path of a field that failed its inline type test: report it, or convert it with its check."""
+    if element is _MISSING:
+        if is_required:
+            errors.append(f"{format_path((path, key))}: missing required key")
+    elif field_check is None:
+        _type_error(tuple(t for t in types if t is not _Missing), element, (path, key), errors)
+    else:
+        converted = field_check(element, (path, key), errors, text)
+        if converted is not element:
+            value[key] = converted
+
+
+def _record(required: Dict[str, Any], optional: Dict[str, Any] = None) -> Check:
+    """
+    Compiles a check for an object with known keys (unknown keys are allowed).
+
+    Fields with inline types (strings, numbers, prose) cost one type test when
+    they are fine; the others (lists, objects, records) call their own check.
+
+    Args:
+        required: Maps the keys that must be present to their field spec.
+        optional: Maps the keys that may be missing to their field spec.
+    """
+    inline_fields = []  # (key, accepted types, check for anything else, required)
+    nested_fields = []  # (key, check, required, container type whose empty values need no check)
+    for specs, is_required in ((required, True), (optional or {}, False)):
+        for key, spec in specs.items():
+            types, field_check = _inline(spec)
+            if types:
+                # A missing optional field is as good as a valid one
+                accepted = types if is_required else types + (_Missing,)
+                inline_fields.append((key, accepted, field_check, is_required))
+            else:
+                nested_fields.append((key, field_check, is_required, getattr(spec, "container", None)))
+
+    def check(value, path, errors, text):
+        if type(value) is not dict:
+            _type_error((dict,), value, path, errors)
+            return value
+        get = value.get
+        for key, accepted, field_check, is_required in inline_fields:
+            element = get(key, _MISSING)
+            if type(element) not in accepted:
+                _field_error(value, key, element, accepted, field_check, is_required, path, errors, text)
+        for key, field_check, is_required, container in nested_fields:
+            element = get(key, _MISSING)
+            if element is _MISSING:
+                if is_required:
+                    errors.append(f"{format_path((path, key))}: missing required key")
+            # Empty lists and objects (most rooms have no enemies) need no call at all
+            elif element or type(element) is not container:
+                converted = field_check(element, (path, key), errors, text)
+                if converted is not element:
+                    value[key] = converted
+        return value
+    return check
+
+
+# --- THE WORLD SCHEMA ---
+
+_STR = (str,)
+_INT = (int,)
+_OPTIONAL_STR = (str, type(None))
+
+_item = _record({"name": _STR, "description": _text}, {"can_take": (bool,)})
+_enemy = _record({"name": _STR, "health": _INT, "attack_power": _INT}, {"reward_item_name": _OPTIONAL_STR})
+_npc = _record({"name": _STR}, {"dialogue_id": _OPTIONAL_STR, "trigger_event_id": _OPTIONAL_STR})
+
+_room = _record({
+    "room_id": _STR,
+    "name": _STR,
+    "description": _text,
+    "exits": _dict_of(_STR),
+    "items": _list_of(_item),
+    "enemies": _list_of(_enemy),
+    "npcs": _list_of(_npc),
+    "interactive_objects": _dict_of(_STR),
+})
+
+_dialogue_tree_fields = _record({
+    "text": _list_of(_text),
+    "choice_offsets": _int_array,
+    "choice_labels": _list_of(_text),
+    "choice_targets": _int_array,
+}, {"speaker": _STR})
+
+
+def _dialogue_tree(value, path, errors, text):
+    """Checks a compiled dialogue tree, including the consistency of its state machine."""
+    error_count = len(errors)
+    _dialogue_tree_fields(value, path, errors, text)
+    if len(errors) > error_count:
+        return value
+
+    node_count = len(value["text"])
+    offsets = value["choice_offsets"]
+    targets = value["choice_targets"]
+    if node_count == 0:
+        errors.append(f"{format_path((path, 'text'))}: a dialogue tree needs at least one node")
+    if len(offsets) != node_count + 1 or offsets[0] != 0 or offsets[-1] != len(targets) \
+            or any(offsets[n] > offsets[n + 1] for n in range(node_count)):
+        errors.append(f"{format_path((path, 'choice_offsets'))}: does not match the nodes and choices")
+    if len(value["choice_labels"]) != len(targets):
+        errors.append(f"{format_path((path, 'choice_labels'))}: expected one label per choice target")
+    for position, target in enumerate(targets):
+        if not 0 <= target < node_count:
+            errors.append(f"{format_path(((path, 'choice_targets'), position))}: unknown node {target}")
+    return value
+
+
+# The 'data' of an event depends on its 'event_type'
+EVENT_DATA: Dict[str, Check] = {
+    "dialogue": _record({}, {"speaker": _STR, "lines": _list_of(_text)}),
+    "read": _record({}, {"text": _text}),
+    "chest": _record({}, {"key_name": _OPTIONAL_STR, "items": _list_of(_item)}),
+    "dialogue_tree": _dialogue_tree,
+}
+
+_event_header = _record({"event_id": _STR, "event_type": _STR, "data": (dict,)})
+
+
+def _event(value, path, errors, text):
+    """Checks an event, picking the schema of its data by event type."""
+    error_count = len(errors)
+    _event_header(value, path, errors, text)
+    if len(errors) > error_count:
+        return value
+
+    data_check = EVENT_DATA.get(value["event_type"])
+    if data_check is None:
+        errors.append(f"{format_path((path, 'event_type'))}: unknown event type "
+                      f"'{value['event_type']}' (expected one of {', '.join(EVENT_DATA)})")
+    else:
+        value["data"] = data_check(value["data"], (path, "data"), errors, text)
+    return value
+
+
+_text_store = _record({"block_size": _INT, "dictionary": _STR, "blocks": _list_of(_STR)}, {"count": _INT})
+_world = _record({"start_room_id": _STR, "rooms": _dict_of(_room)}, {"events": _dict_of(_event)})
+
+
+def _report_unknown_refs(value: Any, path: Path, unknown: Set[int], errors: List[str]):
+    """Finds the TextRefs pointing outside the text store (only run when there are some)."""
+    stack = [(value, path)]
+    while stack:
+        current, current_path = stack.pop()
+        if type(current) is TextRef:
+            if current.text_id in unknown:
+                errors.append(f"{format_path(current_path)}: text reference {current.text_id} is not in the text store")
+        elif type(current) is dict:
+            stack.extend((element, (current_path, key)) for key, element in current.items())
+        elif type(current) is list:
+            stack.extend((element, (current_path, position)) for position, element in enumerate(current))
+
+
+def _check_room_references(world: Any, errors: List[str]):
+    """Reports a start room and exits leading to rooms the world does not have (parts with type errors are skipped)."""
+    if type(world) is not dict or type(world.get("rooms")) is not dict:
+        return
+    rooms = world["rooms"]
+
+    start_room_id = world.get("start_room_id")
+    if type(start_room_id) is str and start_room_id not in rooms:
+        errors.append(f"$.start_room_id: unknown room '{start_room_id}'")
+
+    for room_id, room in rooms.items():
+        exits = room.get("exits") if type(room) is dict else None
+        if type(exits) is not dict:
+            continue
+        for direction, target in exits.items():
+            if type(target) is str and target not in rooms:
+                errors.append(f"{format_path(((((None, 'rooms'), room_id), 'exits'), direction))}: "
+                              f"exit to unknown room '{target}'")
+
+
+class WorldDecodeError(Exception):
+    """Raised when a world file does not match the schema."""
+    def __init__(self, errors: List[str]):
+        super().__init__(f"{len(errors)} schema error(s), first: {errors[0]}")
+        self.errors = errors
+
+
+class WorldDecoder:
+    """Turns a world JSON file into the runtime dictionaries, checking the schema on the way."""
+    def __init__(self, text: TextReader):
+        """
+        Initializes the decoder.
+
+        Args:
+            text: The reader that will serve the world's prose (loaded from its text store).
+        """
+        self.text = text
+
+    def decode(self, f: IO) -> Dict[str, Any]:
+        """
+        Decodes an open world file.
+
+        Text references are replaced while parsing, so the temporary
+        {"$text": n} objects never pile up in memory.
+
+        Args:
+            f: The file to read.
+
+        Returns:
+            The world dictionary, ready for the engine.
+
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON.
+            WorldDecodeError: If the world does not match the schema.
+        """
+        return self.decode_world(json.load(f, object_hook=self.text.object_hook))
+
+    def decode_world(self, world: Any) -> Dict[str, Any]:
+        """Checks and converts an already parsed world (see decode()); text references may be raw or TextRefs."""
+        errors: List[str] = []
+        root = None
+
+        # The text store must be loaded before the walk can check prose references
+        if type(world) is dict and "text_store" in world:
+            error_count = len(errors)
+            _text_store(world["text_store"], (root, "text_store"), errors, self.text)
+            if len(errors) == error_count:
+                self.text.load(world["text_store"])
+
+        _world(world, root, errors, self.text)
+        _check_room_references(world, errors)
+
+        # References converted while parsing are range-checked here, all at once
+        unknown = {text_id for text_id in self.text.referenced_ids() if not 0 <= text_id < self.text.count}
+        if unknown:
+            _report_unknown_refs(world, root, unknown, errors)
+
+        if errors:
+            raise WorldDecodeError(errors)
+        return world
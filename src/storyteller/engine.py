@@ -1,8 +1,16 @@
 """The main game engine, managing the load, loop, and display."""
+import io
 import json
-from typing import Dict, Any
+import time
+from contextlib import redirect_stdout
+from itertools import islice
+from typing import Dict, Any, Set, TextIO
+from storywriter.index import WorldIndex, IndexOverlay
+from storywriter.text_store import TextReader
 from .player import Player
 from .command import Command
+from .shared_world import SharedWorld
+from .decoder import WorldDecoder, WorldDecodeError
 
 class GameEngine:
     """
@@ -14,6 +22,9 @@ class GameEngine:
         """Initializes the engine state."""
         self.game_map: Dict[str, Any] = {}
         self.all_events: Dict[str, Any] = {}
+        self.index: WorldIndex = None
+        self.text = TextReader()
+        self.world: SharedWorld = None  # Set when playing on a shared world
         self.player: Player = None
         self.is_running = False
 
@@ -21,6 +32,9 @@ class GameEngine:
         """
         Loads the game data from a JSON file and initializes the Player.
 
+        The file is checked against the world schema while it is decoded;
+        every schema error is reported with its JSON path.
+
         Args:
             filename: The path to the game data file.
 
@@ -28,17 +42,17 @@ class GameEngine:
             True if the game loaded successfully, False otherwise.
         """
         try:
+            # Prose references are resolved lazily through self.text
+            self.text = TextReader()
             with open(filename, 'r') as f:
-                game_data = json.load(f)
+                game_data = WorldDecoder(self.text).decode(f)
             
-            self.game_map = game_data.get('rooms', {})
+            self.game_map = game_data['rooms']
+            self.world = None
             self.all_events = game_data.get('events', {})
-            start_room_id = game_data.get('start_room_id')
-            
-            if not start_room_id or start_room_id not in self.game_map:
-                print("Error: Start room is invalid or missing.")
-                return False
+            start_room_id = game_data['start_room_id']
 
+            self.index = WorldIndex.from_rooms(self.game_map, self.all_events)
             self.player = Player(start_room_id)
             self.is_running = True
             print(f"Game loaded successfully from {filename}.")
@@ -49,6 +63,54 @@ class GameEngine:
         except json.JSONDecodeError:
             print(f"Error: Could not parse JSON data from '{filename}'. Check file integrity.")
             return False
+        except WorldDecodeError as e:
+            print(f"Error: '{filename}' does not match the game format:")
+            for error in e.errors:
+                print(f"  - {error}")
+            return False
+
+    def attach_world(self, world: SharedWorld) -> bool:
+        """
+        Starts a new session on a world shared between processes.
+
+        Rooms are decoded from the shared segment on first visit and kept
+        as a private copy for this session only. Queries read the world's
+        shared index through a private overlay holding this session's changes.
+
+        Args:
+            world: The shared world to play in.
+
+        Returns:
+            True if the session started successfully, False otherwise.
+        """
+        if not world.has_room(world.start_room_id):
+            print("Error: Start room is invalid or missing.")
+            return False
+
+        self.world = world
+        self.game_map = world.room_view()
+        self.all_events = world.event_view()
+        self.index = IndexOverlay(world.index)
+        self.text = world.text
+        self.player = Player(world.start_room_id)
+        self.is_running = True
+        return True
+
+    def find(self, category: str, name: str) -> Set[str]:
+        """
+        Finds the rooms currently containing an item, NPC, enemy, object or event.
+
+        Args:
+            category: One of WorldIndex.CATEGORIES (e.g. 'item').
+            name: The name to look up (case-insensitive).
+
+        Returns:
+            The set of matching room IDs.
+        """
+        if self.index is None:
+            print("Error: No world index is available for this session.")
+            return set()
+        return self.index.rooms_with(category, name)
 
     def display_current_room(self):
         """Displays the name and description of the player's current room."""
@@ -75,6 +137,27 @@ class GameEngine:
         print("-------------------------------------")
 
 
+    def execute(self, user_input: str) -> bool:
+        """
+        Processes a single command and re-displays the room after movement.
+
+        Args:
+            user_input: The raw command string.
+
+        Returns:
+            True if the game should continue, False if the game should quit.
+        """
+        previous_room_id = self.player.current_room_id
+        continue_game = Command.process(user_input, self.player, self.game_map, self.all_events, self.index)
+
+        if not continue_game:
+            self.is_running = False
+        # After the player moved, display the new room description
+        elif self.player.current_room_id != previous_room_id:
+            self.display_current_room()
+
+        return continue_game
+
     def run(self):
         """Runs the main game loop."""
         if not self.is_running:
@@ -85,23 +168,82 @@ class GameEngine:
 
         while self.is_running:
             try:
-                user_input = input("What do you do? (Type 'look' or 'quit') > ").strip()
+                try:
+                    user_input = input("What do you do? (Type 'look' or 'quit') > ").strip()
+                except EOFError:
+                    # End of input (Ctrl+D or a piped file ran out) ends the game
+                    self.is_running = False
+                    break
                 if not user_input:
                     continue
 
                 # Process the command, which may update self.is_running
-                continue_game = Command.process(user_input, self.player, self.game_map, self.all_events)
-                
-                if not continue_game:
-                    self.is_running = False
+                if not self.execute(user_input):
                     break
-
-                # After processing movement, display the new room description
-                if user_input.lower().startswith("go"):
-                    self.display_current_room()
                     
             except Exception as e:
                 print(f"\n[SYSTEM ERROR]: An unhandled error occurred: {e}")
                 print("The game state may be unstable. Try a different command.")
 
-        print("\n*** Game Over. Thanks for playing! ***")
\ No newline at end of file
+        print("\n*** Game Over. Thanks for playing! ***")
+
+    def run_pipe(self, commands: TextIO, output: TextIO, block_size: int = 256, json_lines: bool = False):
+        """
+        Runs the game non-interactively, e.g. on a command file piped to stdin.
+
+        Commands are read in blocks of lines and no prompt is shown. The output
+        of a whole block is collected and written to the output stream with a
+        single write and flush.
+
+        Args:
+            commands: Stream with one command per line.
+            output: Stream receiving the game output.
+            block_size: Number of commands read and flushed together.
+            json_lines: Write one JSON object per command instead of the plain text
+                ({"command", "output", "room", "elapsed"}; the first one, with a null
+                command, holds the starting room).
+        """
+        if not self.is_running:
+            print("Engine not ready. Please call load_game() first.")
+            return
+
+        def run_one(command: str) -> str:
+            buffer = io.StringIO()
+            start = time.perf_counter()
+            with redirect_stdout(buffer):
+                try:
+                    if command is None:
+                        self.display_current_room()
+                    else:
+                        self.execute(command)
+                except Exception as e:
+                    print(f"\n[SYSTEM ERROR]: An unhandled error occurred: {e}")
+            if not json_lines:
+                return buffer.getvalue()
+            return json.dumps({
+                "command": command,
+                "output": buffer.getvalue(),
+                "room": self.player.current_room_id,
+                "elapsed": time.perf_counter() - start
+            }) + "\n"
+
+        results = [run_one(None)]
+        while self.is_running:
+            block = list(islice(commands, block_size))
+            if not block:
+                break
+            for line in block:
+                command = line.strip()
+                if command:
+                    results.append(run_one(command))
+                if not self.is_running:
+                    break
+            output.write("".join(results))
+            output.flush()
+            results.clear()
+
+        if not json_lines:
+            results.append("\n*** Game Over. Thanks for playing! ***\n")
+        output.write("".join(results))
+        output.flush()
+        self.is_running = False
@@ -0,0 +1,180 @@
+"""
+Memory accounting for loaded worlds and game sessions.
+
+memory_report() measures object sizes directly (sys.getsizeof, following
+containers) and splits them into the world (rooms, events, text, index) and
+the private state of each session. MemoryTracker uses tracemalloc to attribute
+allocations to engine subsystems, so two snapshots show which part grew.
+"""
+import os
+import sys
+import tracemalloc
+from typing import Dict, Any, List, Set
+from storywriter.text_store import TextRef
+from .engine import GameEngine
+from .shared_world import WorldView
+
+
+def deep_sizeof(obj: Any, seen: Set[int] = None) -> int:
+    """
+    Returns the size of an object and everything it holds, in bytes.
+
+    Objects already in seen are not counted again, so passing the same set to
+    several calls attributes shared objects to whoever was measured first.
+
+    Args:
+        obj: The object to measure.
+        seen: IDs of objects that were already counted (updated in place).
+    """
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, TextRef):
+            # The reader behind a reference belongs to the world's text, not to the holder
+            continue
+        elif hasattr(current, '__dict__') and not isinstance(current, type):
+            stack.append(vars(current))
+    return size
+
+
+def _session_rooms(engine: GameEngine) -> bool:
+    """Tells whether the engine's rooms are a private per-session copy (shared world mode)."""
+    return isinstance(engine.game_map, WorldView)
+
+
+def memory_report(engines: List[GameEngine]) -> Dict[str, Any]:
+    """
+    Reports the memory used by the worlds and sessions of several engines.
+
+    World structures are counted once even when engines share them. In shared
+    world mode the rooms a session has decoded are its private delta and are
+    counted with the session, as is its IndexOverlay; the shared index and
+    segment belong to the world. An engine that loaded its own file (no shared
+    world) changes its index as the game goes, so that index is session state.
+
+    Args:
+        engines: The engines (one per session) to measure.
+
+    Returns:
+        {"world": {part: bytes}, "sessions": [{part: bytes}, ...]}
+    """
+    seen: Set[int] = set()
+    world = {"rooms": 0, "events": 0, "text": 0, "index": 0, "shared_segment": 0}
+    segments = set()
+
+    # Measure the world first, so objects shared with a session (e.g. chest items) count as world
+    for engine in engines:
+        if not _session_rooms(engine):
+            world["rooms"] += deep_sizeof(engine.game_map, seen)
+        world["events"] += deep_sizeof(engine.all_events, seen)
+        world["text"] += deep_sizeof(vars(engine.text), seen)
+        if engine.world is not None:
+            world["index"] += deep_sizeof(vars(engine.world.index), seen)
+        if engine.world is not None and engine.world.name not in segments:
+            segments.add(engine.world.name)
+            world["shared_segment"] += engine.world.size
+    world["total"] = sum(world.values())
+
+    sessions = []
+    for engine in engines:
+        session = {
+            "player": deep_sizeof(engine.player, seen),
+            "rooms": deep_sizeof(engine.game_map, seen) if _session_rooms(engine) else 0,
+            "index": deep_sizeof(vars(engine.index), seen) if engine.index is not None else 0,
+        }
+        session["total"] = sum(session.values())
+        sessions.append(session)
+
+    return {"world": world, "sessions": sessions}
+
+
+# Source files of the engine, mapped to the subsystem their allocations are charged to
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBSYSTEMS = {
+    os.path.join("storyteller", "engine.py"): "engine",
+    os.path.join("storyteller", "command.py"): "commands",
+    os.path.join("storyteller", "player.py"): "player",
+    os.path.join("storyteller", "decoder.py"): "decoder",
+    os.path.join("storyteller", "shared_world.py"): "shared_world",
+    os.path.join("storyteller", "workers.py"): "workers",
+    os.path.join("storywriter", "text_store.py"): "text",
+    os.path.join("storywriter", "index.py"): "index",
+}
+
+
+def _subsystem(traceback: tracemalloc.Traceback) -> str:
+    """Charges an allocation to the innermost engine file on its stack."""
+    for frame in reversed(traceback):
+        relative = os.path.relpath(frame.filename, _PACKAGE_ROOT)
+        if relative in SUBSYSTEMS:
+            return SUBSYSTEMS[relative]
+        if relative.startswith("storywriter"):
+            return "storywriter"
+    return "other"
+
+
+class MemoryTracker:
+    """
+    Optional tracemalloc-based tracking of allocations per engine subsystem.
+
+    Allocations are charged to the innermost engine file on their stack, so
+    e.g. the dictionaries json.load creates for the decoder count as "decoder".
+    """
+    def __init__(self, frames: int = 25):
+        """
+        Initializes the tracker (call start() to begin tracing).
+
+        Args:
+            frames: Stack depth recorded per allocation; deeper stacks attribute better but cost more.
+        """
+        self.frames = frames
+        self._started_here = False
+
+    def start(self):
+        """Starts tracing allocations (if tracemalloc is not already running)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+
+    def stop(self):
+        """Stops tracing if this tracker started it."""
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def __enter__(self) -> 'MemoryTracker':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Returns the bytes currently allocated by each subsystem."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        usage: Dict[str, int] = {}
+        for stat in snapshot.statistics('traceback'):
+            subsystem = _subsystem(stat.traceback)
+            usage[subsystem] = usage.get(subsystem, 0) + stat.size
+        return usage
+
+    @staticmethod
+    def diff(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+        """Returns the growth (or shrinkage) of each subsystem between two snapshots."""
+        return {subsystem: after.get(subsystem, 0) - before.get(subsystem, 0)
+                for subsystem in sorted(set(before) | set(after))}
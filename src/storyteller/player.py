@@ -14,6 +14,7 @@ class Player:
         self.health = 100
         self.attack_power = 10
         self.is_in_combat = False
+        self.conversation = None # (dialogue tree event ID, current node) while talking
 
     def take_item(self, item_dict: dict):
         """
@@ -0,0 +1,239 @@
+"""
+Shares one compiled game world between several worker processes.
+
+The world is serialized once into a multiprocessing.shared_memory segment:
+a fixed-size header, a JSON table (offsets, text store and the WorldIndex)
+and then one JSON blob per room and per event. Workers attach to the segment by name and decode a room only
+when a session first visits it. Decoded rooms live in a per-session overlay,
+so every change a session makes (e.g. taking an item) stays private to it.
+"""
+import json
+import struct
+import sys
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Any, Callable, Optional
+from storywriter.index import WorldIndex
+from storywriter.text_store import TextReader, TextRef
+from .decoder import WorldDecoder
+
+# Layout: <table length><table JSON><room and event blobs...>
+_HEADER = struct.Struct('<Q')
+
+
+def _to_json(value: Any) -> Any:
+    """json.dumps default turning what WorldDecoder produces back into its file form."""
+    if isinstance(value, TextRef):
+        return {"$text": value.text_id}
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class WorldView(dict):
+    """
+    A dictionary that fills itself from a SharedWorld on first access.
+
+    Every entry a session reads is decoded into a private copy and kept for
+    the rest of the session, whether the session changes it or not, so the
+    memory of a session grows with the number of rooms it has visited.
+    Iteration and len() only cover entries that were loaded.
+    """
+    def __init__(self, has_key: Callable[[str], bool], read: Callable[[str], Dict[str, Any]]):
+        """
+        Initializes an empty view.
+
+        Args:
+            has_key: Tells whether the shared world contains a key.
+            read: Decodes the value for a key from the shared world.
+        """
+        super().__init__()
+        self._has_key = has_key
+        self._read = read
+
+    def __missing__(self, key: str) -> Dict[str, Any]:
+        if not self._has_key(key):
+            raise KeyError(key)
+        value = self._read(key)
+        self[key] = value
+        return value
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or self._has_key(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class SharedWorld:
+    """
+    A read-only game world stored in a shared memory segment.
+
+    The creating process owns the segment and must call unlink() when done.
+    Other processes call attach() with the segment name and close() on exit;
+    child processes of the creator (like SessionSupervisor workers) pass
+    child_process=True.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        Reads the offset table of an existing segment.
+
+        Args:
+            shm: The shared memory segment holding the world.
+            owner: Whether this process created the segment.
+        """
+        self._shm = shm
+        self._owner = owner
+
+        (index_size,) = _HEADER.unpack_from(shm.buf, 0)
+        self._data_start = _HEADER.size + index_size
+        index = json.loads(bytes(shm.buf[_HEADER.size:self._data_start]))
+
+        self.start_room_id: str = index['start_room_id']
+        self._rooms: Dict[str, list] = index['rooms']
+        self._events: Dict[str, list] = index['events']
+        # Compressed prose stays in this process and is decompressed on display
+        self.text = TextReader()
+        if index.get('text_store'):
+            self.text.load(index['text_store'])
+        # Built once by the creator; sessions change it only through their own IndexOverlay
+        self.index = WorldIndex.from_dict(index['world_index'])
+        # Events are never modified at runtime, so one decoded copy per process is enough
+        self._event_view: Optional[WorldView] = None
+
+    @classmethod
+    def create(cls, game_data: Dict[str, Any], name: str = None) -> 'SharedWorld':
+        """
+        Serializes a game world into a new shared memory segment.
+
+        Args:
+            game_data: The world in its JSON form (as produced by GameData.to_dict()
+                or WorldDecoder.decode()).
+            name: Optional name for the segment; a random one is used otherwise.
+
+        Returns:
+            The SharedWorld owning the new segment.
+        """
+        blobs = []
+        offset = 0
+        rooms = game_data.get('rooms', {})
+        events = game_data.get('events', {})
+
+        def add_blob(value: Any) -> list:
+            nonlocal offset
+            blob = json.dumps(value, separators=(',', ':'), default=_to_json).encode('utf-8')
+            blobs.append(blob)
+            span = [offset, len(blob)]
+            offset += len(blob)
+            return span
+
+        index = {
+            "start_room_id": game_data.get('start_room_id'),
+            "rooms": {room_id: add_blob(room) for room_id, room in rooms.items()},
+            "events": {event_id: add_blob(event) for event_id, event in events.items()},
+            "text_store": game_data.get('text_store'),
+            "world_index": WorldIndex.from_rooms(rooms, events).to_dict(),
+        }
+        index_blob = json.dumps(index, separators=(',', ':')).encode('utf-8')
+
+        size = _HEADER.size + len(index_blob) + offset
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, len(index_blob))
+        position = _HEADER.size
+        for blob in [index_blob] + blobs:
+            shm.buf[position:position + len(blob)] = blob
+            position += len(blob)
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def from_file(cls, filename: str, name: str = None) -> 'SharedWorld':
+        """
+        Loads a game JSON file and serializes it into a new shared memory segment.
+
+        The file is checked with WorldDecoder first, so a broken world fails
+        here instead of inside a worker.
+
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON.
+            WorldDecodeError: If the world does not match the game format.
+        """
+        with open(filename, 'r') as f:
+            # Text references go back to {"$text": id} in the blobs; the text store travels in the table
+            return cls.create(WorldDecoder(TextReader()).decode(f), name)
+
+    @classmethod
+    def attach(cls, name: str, child_process: bool = False) -> 'SharedWorld':
+        """
+        Attaches to a segment created by another process.
+
+        Before Python 3.13 attaching registers the segment with the resource
+        tracker of the process, which destroys it when the process exits. A
+        child of the creator shares the creator's tracker, so the registration
+        is harmless there (and removing it would remove the creator's too);
+        any other process must not leave the segment registered.
+
+        Args:
+            name: The segment name (SharedWorld.name in the creating process).
+            child_process: Whether this process is a child of the creator.
+        """
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+        shm = shared_memory.SharedMemory(name=name)
+        if not child_process:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        """The name other processes use to attach to the segment."""
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        """Size of the segment in bytes."""
+        return self._shm.size
+
+    def _decode(self, span: list) -> Dict[str, Any]:
+        start = self._data_start + span[0]
+        return json.loads(bytes(self._shm.buf[start:start + span[1]]), object_hook=self.text.object_hook)
+
+    def has_room(self, room_id: str) -> bool:
+        """Checks if the world contains a room."""
+        return room_id in self._rooms
+
+    def read_room(self, room_id: str) -> Dict[str, Any]:
+        """Decodes a fresh, private copy of a room."""
+        return self._decode(self._rooms[room_id])
+
+    def has_event(self, event_id: str) -> bool:
+        """Checks if the world contains an event."""
+        return event_id in self._events
+
+    def read_event(self, event_id: str) -> Dict[str, Any]:
+        """Decodes a fresh copy of an event."""
+        return self._decode(self._events[event_id])
+
+    def room_view(self) -> WorldView:
+        """Creates the private room map of a new session."""
+        return WorldView(self.has_room, self.read_room)
+
+    def event_view(self) -> WorldView:
+        """Returns the event map, shared by all sessions of this process."""
+        if self._event_view is None:
+            self._event_view = WorldView(self.has_event, self.read_event)
+        return self._event_view
+
+    def close(self):
+        """Detaches this process from the segment."""
+        self._event_view = None
+        self._shm.close()
+
+    def unlink(self):
+        """Closes and destroys the segment. Only the creating process should call this."""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
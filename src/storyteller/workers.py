@@ -0,0 +1,182 @@
+"""
+Runs many game sessions across several worker processes.
+
+Every worker attaches to the same SharedWorld, so the world is stored once no
+matter how many workers are running. Each session is pinned to one worker,
+which keeps its GameEngine (and so its private room copies) between batches.
+"""
+import io
+import multiprocessing
+import queue
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Set, Tuple
+from .engine import GameEngine
+from .shared_world import SharedWorld
+
+
+def _worker_main(world_name: str, inbox: multiprocessing.Queue, outbox: multiprocessing.Queue):
+    """
+    Entry point of a worker process.
+
+    Receives (session_id, commands) batches and answers with
+    (session_id, outputs, running): one output string per command, and whether
+    the session is still running after the batch. A None message stops the worker.
+    """
+    world = SharedWorld.attach(world_name, child_process=True)
+    sessions: Dict[str, GameEngine] = {}
+
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+
+        session_id, commands = message
+        outputs = []
+        engine = sessions.get(session_id)
+
+        for command in commands:
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                if engine is None:
+                    engine = GameEngine()
+                    if engine.attach_world(world):
+                        sessions[session_id] = engine
+                try:
+                    if engine.is_running and not engine.execute(command):
+                        # The session quit, so its private state can go
+                        sessions.pop(session_id, None)
+                except Exception as e:
+                    print(f"\n[SYSTEM ERROR]: An unhandled error occurred: {e}")
+            outputs.append(buffer.getvalue())
+
+        outbox.put((session_id, outputs, session_id in sessions))
+
+    sessions.clear()
+    world.close()
+
+
+class SessionSupervisor:
+    """
+    Spreads game sessions over a pool of worker processes.
+
+    Sessions are assigned to workers round-robin the first time they are seen
+    and stay on that worker, so commands of one session always run in order.
+    A session that quits is listed in finished_sessions; submitting commands
+    under its id again starts a brand-new session.
+    """
+    # How often a waiting supervisor checks that its workers are still alive, in seconds
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, world: SharedWorld, num_workers: int = None):
+        """
+        Initializes the supervisor (call start() or use it as a context manager).
+
+        Args:
+            world: The shared world every worker attaches to.
+            num_workers: Number of worker processes (defaults to the CPU count).
+        """
+        self.world = world
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self._workers: List[multiprocessing.Process] = []
+        self._inboxes: List[multiprocessing.Queue] = []
+        self._outbox: multiprocessing.Queue = None
+        self._assignment: Dict[str, int] = {}
+        self.finished_sessions: Set[str] = set()
+
+    def start(self):
+        """Starts the worker processes."""
+        self._outbox = multiprocessing.Queue()
+        for _ in range(self.num_workers):
+            inbox = multiprocessing.Queue()
+            worker = multiprocessing.Process(
+                target=_worker_main, args=(self.world.name, inbox, self._outbox), daemon=True)
+            worker.start()
+            self._inboxes.append(inbox)
+            self._workers.append(worker)
+
+    def stop(self):
+        """Asks every worker to finish and waits for it."""
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+        self._inboxes.clear()
+        self._assignment.clear()
+        self.finished_sessions.clear()
+
+    def __enter__(self) -> 'SessionSupervisor':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def submit(self, session_id: str, commands: List[str]):
+        """
+        Queues a batch of commands for a session without waiting for the result.
+
+        Args:
+            session_id: Identifier of the session (a new session is created on first use).
+            commands: The raw command strings, run in order.
+        """
+        worker = self._assignment.get(session_id)
+        if worker is None:
+            worker = len(self._assignment) % self.num_workers
+            self._assignment[session_id] = worker
+        self.finished_sessions.discard(session_id)
+        self._inboxes[worker].put((session_id, list(commands)))
+
+    def next_result(self, timeout: float = None) -> Tuple[str, List[str], bool]:
+        """
+        Waits for the next finished batch.
+
+        Args:
+            timeout: Maximum number of seconds to wait (forever if None).
+
+        Returns:
+            (session_id, outputs, running), where running is False if the session quit.
+
+        Raises:
+            RuntimeError: If a worker process died (its sessions are lost).
+            TimeoutError: If no result arrived within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                session_id, outputs, running = self._outbox.get(timeout=wait)
+                break
+            except queue.Empty:
+                for worker in self._workers:
+                    if not worker.is_alive():
+                        raise RuntimeError(
+                            f"Worker process {worker.pid} died with exit code {worker.exitcode}.")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"No session result within {timeout} seconds.")
+
+        if not running:
+            self.finished_sessions.add(session_id)
+        return session_id, outputs, running
+
+    def run_sessions(self, scripts: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Runs a batch of commands for each session and waits for all of them.
+
+        Args:
+            scripts: Maps session ids to the commands to run.
+
+        Returns:
+            Maps session ids to the output of each command (sessions that
+            quit are listed in finished_sessions).
+        """
+        for session_id, commands in scripts.items():
+            self.submit(session_id, commands)
+        results = {}
+        for _ in scripts:
+            session_id, outputs, _running = self.next_result()
+            results[session_id] = outputs
+        return results
@@ -1,6 +1,9 @@
 """Initialization for the game_builder package."""
-from .game_data import GameData, Room, Item, Character, Enemy, NPC, Event
+from .game_data import GameData, Room, Item, Character, Enemy, NPC, Event, DialogueTree
 from .builder import GameBuilder
+from .index import WorldIndex, IndexOverlay
+from .text_store import TextStore, TextReader
 
 # Expose core classes for easy import: from game_builder import GameBuilder, Room, Item, etc.
-__all__ = ['GameData', 'Room', 'Item', 'Character', 'Enemy', 'NPC', 'Event', 'GameBuilder']
\ No newline at end of file
+__all__ = ['GameData', 'Room', 'Item', 'Character', 'Enemy', 'NPC', 'Event', 'DialogueTree',
+           'GameBuilder', 'WorldIndex', 'IndexOverlay', 'TextStore', 'TextReader']
\ No newline at end of file
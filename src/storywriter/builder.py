@@ -1,23 +1,31 @@
 """Handles saving and loading the GameData structure using JSON."""
 import json
 from .game_data import GameData
+from .text_store import pack_world_text
 
 class GameBuilder:
     """Static methods for serializing the game world data."""
 
     @staticmethod
-    def save_game(game_data: GameData, filename: str):
+    def save_game(game_data: GameData, filename: str, compress_text: bool = False):
         """
         Saves the GameData object to a JSON file.
 
         Args:
             game_data: The fully constructed GameData object.
             filename: The path to the output JSON file.
+            compress_text: Store all the prose in a deduplicated, compressed text store
+                and write compact JSON. The text of dialogue trees goes into a
+                text store either way, so only the nodes a player visits are
+                ever decompressed.
         """
         try:
+            # Use to_dict() method of the root object for recursive serialization
+            world = game_data.to_dict()
+            world = pack_world_text(world, trees_only=not compress_text)
             with open(filename, 'w') as f:
-                # Use to_dict() method of the root object for recursive serialization
-                json.dump(game_data.to_dict(), f, indent=4)
+                # Fully packed worlds are meant for machines, so skip the indentation too
+                json.dump(world, f, indent=None if compress_text else 4)
             print(f"Game saved successfully to {filename}")
         except Exception as e:
             print(f"Error saving game: {e}")
\ No newline at end of file
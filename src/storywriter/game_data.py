@@ -3,6 +3,7 @@ Defines the core object-oriented models for the game world.
 
 These classes are designed to be easily serialized to a JSON format.
 """
+from .index import WorldIndex
 
 class Item:
     """Represents a passive object in the game world."""
@@ -106,6 +107,66 @@ class Event:
         return self.__dict__
 
 
+class DialogueTree(Event):
+    """
+    A branching conversation made of nodes the player moves between by choosing answers.
+
+    On save the tree is compiled into a compact state machine: nodes become
+    integers (the first node added is 0) and all choices are stored in flat
+    arrays, so the runtime picks the next node with a single index lookup.
+    """
+    def __init__(self, event_id: str, speaker: str):
+        """
+        Initializes an empty DialogueTree.
+
+        Args:
+            event_id: Unique identifier for the event.
+            speaker: The name shown as the other side of the conversation.
+        """
+        super().__init__(event_id, "dialogue_tree", {})
+        self.speaker = speaker
+        self.nodes = {} # {"node_key": (text, [(answer, "next_node_key"), ...])}
+
+    def add_node(self, node_key: str, text: str, choices: list = None):
+        """
+        Adds a node to the conversation (the first node added is where it starts).
+
+        Args:
+            node_key: Name of the node, used as a target by choices.
+            text: What the speaker says at this node.
+            choices: List of (answer, next_node_key) pairs; a node without choices ends the conversation.
+        """
+        self.nodes[node_key] = (text, choices or [])
+
+    def to_dict(self) -> dict:
+        """Compiles the tree into its integer-indexed form for serialization."""
+        if not self.nodes:
+            raise ValueError(f"Dialogue '{self.event_id}' has no nodes; add at least one with add_node().")
+        node_ids = {key: node_id for node_id, key in enumerate(self.nodes)}
+        text, offsets, labels, targets = [], [0], [], []
+
+        for key, (node_text, choices) in self.nodes.items():
+            text.append(node_text)
+            for answer, target_key in choices:
+                if target_key not in node_ids:
+                    raise ValueError(f"Dialogue '{self.event_id}': node '{key}' points to unknown node '{target_key}'.")
+                labels.append(answer)
+                targets.append(node_ids[target_key])
+            offsets.append(len(targets))
+
+        return {
+            "event_id": self.event_id,
+            "event_type": self.event_type,
+            "data": {
+                "speaker": self.speaker,
+                "text": text,
+                "choice_offsets": offsets,  # choices of node n are at [offsets[n], offsets[n + 1])
+                "choice_labels": labels,
+                "choice_targets": targets
+            }
+        }
+
+
 class Room:
     """Represents a location in the game world."""
     def __init__(self, name: str, description: str, room_id: str):
@@ -181,6 +242,12 @@ class GameData:
         """Adds an Event object to the central event store."""
         self.events[event.event_id] = event
 
+    def build_index(self) -> WorldIndex:
+        """Builds an inverted index from content names to the rooms holding them."""
+        return WorldIndex.from_rooms(
+            {id: room.to_dict() for id, room in self.rooms.items()},
+            {id: event.to_dict() for id, event in self.events.items()})
+
     def to_dict(self) -> dict:
         """Converts the entire game structure to a dictionary."""
         return {
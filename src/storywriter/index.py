@@ -0,0 +1,190 @@
+"""
+An inverted index from the names of world contents to the rooms holding them.
+
+The index answers questions like "which rooms contain a Torch?" or "which
+chest needs the Sunstone Key?" without walking every room. It is built from
+the JSON form of the world, so both the builder and the runtime can use it.
+"""
+from typing import Dict, Any, Set
+
+# Name lookups are case-insensitive, like player commands
+def _key(name: str) -> str:
+    return name.lower()
+
+
+class WorldIndex:
+    """
+    Maps item, NPC, enemy, object and event names to room IDs.
+
+    Categories:
+        item:   items lying in a room or stored in a chest in that room.
+        npc:    NPCs by name.
+        enemy:  enemies by name.
+        object: interactive object names (e.g. "chest", "inscription").
+        event:  event IDs referenced by an interactive object or an NPC.
+    """
+    CATEGORIES = ('item', 'npc', 'enemy', 'object', 'event')
+
+    def __init__(self):
+        """Initializes an empty index."""
+        # {category: {name: {room_id: count}}}, counts handle duplicates in one room
+        self._rooms: Dict[str, Dict[str, Dict[str, int]]] = {c: {} for c in self.CATEGORIES}
+        self._locks: Dict[str, Set[str]] = {}  # {key name: {chest event IDs}}
+        self._opened_chests: Set[str] = set()
+
+    @classmethod
+    def from_rooms(cls, rooms: Dict[str, Any], events: Dict[str, Any]) -> 'WorldIndex':
+        """
+        Builds the index in one walk over the world.
+
+        Args:
+            rooms: The room dictionaries, keyed by room ID.
+            events: The event dictionaries, keyed by event ID.
+
+        Returns:
+            The populated WorldIndex.
+        """
+        index = cls()
+
+        for event_id, event in events.items():
+            if event['event_type'] == 'chest' and event['data'].get('key_name'):
+                index._locks.setdefault(_key(event['data']['key_name']), set()).add(event_id)
+
+        for room_id, room in rooms.items():
+            for item in room['items']:
+                index.add('item', item['name'], room_id)
+            for npc in room['npcs']:
+                index.add('npc', npc['name'], room_id)
+                for event_id in (npc.get('dialogue_id'), npc.get('trigger_event_id')):
+                    if event_id:
+                        index.add('event', event_id, room_id)
+            for enemy in room['enemies']:
+                index.add('enemy', enemy['name'], room_id)
+            for name, event_id in room['interactive_objects'].items():
+                index.add('object', name, room_id)
+                index.add('event', event_id, room_id)
+                event = events.get(event_id)
+                if event and event['event_type'] == 'chest':
+                    for item in event['data'].get('items', []):
+                        index.add('item', item['name'], room_id)
+
+        return index
+
+    def to_dict(self) -> dict:
+        """Converts the index to a dictionary for serialization (opened chests are not kept)."""
+        return {
+            "rooms": self._rooms,
+            "locks": {key: sorted(events) for key, events in self._locks.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WorldIndex':
+        """Rebuilds an index serialized with to_dict()."""
+        index = cls()
+        index._rooms = data['rooms']
+        index._locks = {key: set(events) for key, events in data['locks'].items()}
+        return index
+
+    def add(self, category: str, name: str, room_id: str):
+        """Records one occurrence of a name in a room."""
+        rooms = self._rooms[category].setdefault(_key(name), {})
+        rooms[room_id] = rooms.get(room_id, 0) + 1
+
+    def remove(self, category: str, name: str, room_id: str):
+        """Forgets one occurrence of a name in a room (missing entries are ignored)."""
+        rooms = self._rooms[category].get(_key(name))
+        if not rooms or room_id not in rooms:
+            return
+        rooms[room_id] -= 1
+        if not rooms[room_id]:
+            del rooms[room_id]
+            if not rooms:
+                del self._rooms[category][_key(name)]
+
+    def open_chest(self, event_data: Dict[str, Any], room_id: str):
+        """
+        Removes the contents of a chest once it has been opened.
+
+        Args:
+            event_data: The dictionary representation of the chest Event.
+            room_id: The room where the chest was opened.
+        """
+        if event_data['event_id'] in self._opened_chests:
+            return
+        self._opened_chests.add(event_data['event_id'])
+        for item in event_data['data'].get('items', []):
+            self.remove('item', item['name'], room_id)
+
+    def rooms_with(self, category: str, name: str) -> Set[str]:
+        """
+        Finds the rooms containing a name.
+
+        Args:
+            category: One of WorldIndex.CATEGORIES.
+            name: The name to look up (case-insensitive).
+
+        Returns:
+            The set of matching room IDs (empty if none).
+        """
+        return set(self._rooms[category].get(_key(name), ()))
+
+    def chests_requiring(self, key_name: str) -> Set[str]:
+        """Returns the IDs of the chest events locked by the given key."""
+        return set(self._locks.get(_key(key_name), ()))
+
+    def names(self, category: str) -> Set[str]:
+        """Returns every (lowercase) name currently indexed in a category."""
+        return set(self._rooms[category])
+
+
+class IndexOverlay(WorldIndex):
+    """
+    A private, changeable view of a WorldIndex shared by many sessions.
+
+    The shared index is never modified: the overlay only stores how many
+    occurrences each session added or removed, so its memory grows with what
+    the session moved, not with the size of the world.
+    """
+    def __init__(self, base: WorldIndex):
+        """
+        Initializes an overlay with no changes.
+
+        Args:
+            base: The shared index to read through to.
+        """
+        super().__init__()
+        self.base = base
+        self._locks = base._locks
+        # self._rooms holds count changes here: {category: {name: {room_id: delta}}}
+
+    def _count(self, category: str, key: str, room_id: str) -> int:
+        base = self.base._rooms[category].get(key, {}).get(room_id, 0)
+        return base + self._rooms[category].get(key, {}).get(room_id, 0)
+
+    def _change(self, category: str, name: str, room_id: str, delta: int):
+        changes = self._rooms[category].setdefault(_key(name), {})
+        changes[room_id] = changes.get(room_id, 0) + delta
+        if not changes[room_id]:
+            del changes[room_id]
+            if not changes:
+                del self._rooms[category][_key(name)]
+
+    def add(self, category: str, name: str, room_id: str):
+        """Records one occurrence of a name in a room."""
+        self._change(category, name, room_id, 1)
+
+    def remove(self, category: str, name: str, room_id: str):
+        """Forgets one occurrence of a name in a room (missing entries are ignored)."""
+        if self._count(category, _key(name), room_id) > 0:
+            self._change(category, name, room_id, -1)
+
+    def rooms_with(self, category: str, name: str) -> Set[str]:
+        """Finds the rooms containing a name (see WorldIndex.rooms_with)."""
+        key = _key(name)
+        candidates = set(self.base._rooms[category].get(key, ())) | set(self._rooms[category].get(key, ()))
+        return {room_id for room_id in candidates if self._count(category, key, room_id) > 0}
+
+    def names(self, category: str) -> Set[str]:
+        """Returns every (lowercase) name currently indexed in a category."""
+        candidates = set(self.base._rooms[category]) | set(self._rooms[category])
+        return {key for key in candidates if self.rooms_with(category, key)}
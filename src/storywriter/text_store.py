@@ -0,0 +1,205 @@
+"""
+Compressed, deduplicated storage for the prose of a game world.
+
+Room and item descriptions, dialogue lines, dialogue tree nodes and answers
+and readable text are moved out of the world into a text store: every
+distinct string is kept once, strings are grouped in blocks and each block
+is zlib-compressed with a shared dictionary. In the saved world the prose
+is replaced by references like {"$text": 12}; at runtime those become
+TextRef objects that decompress their block only when the text is displayed.
+"""
+import base64
+import json
+import zlib
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, Set
+
+# zlib only looks back 32 KB, so a larger dictionary would be wasted
+_MAX_DICTIONARY_SIZE = 32 * 1024
+
+
+class TextStore:
+    """Collects prose strings while a world is being saved."""
+    def __init__(self, block_size: int = 64):
+        """
+        Initializes an empty store.
+
+        Args:
+            block_size: Number of texts compressed together in one block.
+        """
+        self.block_size = block_size
+        self._ids: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._uses: Counter = Counter()
+
+    def add(self, text: str) -> Dict[str, int]:
+        """
+        Stores a text (once, however often it is added) and returns its reference.
+
+        Args:
+            text: The prose to store.
+
+        Returns:
+            The reference that replaces the text in the world, e.g. {"$text": 12}.
+        """
+        text_id = self._ids.get(text)
+        if text_id is None:
+            text_id = self._ids[text] = len(self._texts)
+            self._texts.append(text)
+        self._uses[text_id] += 1
+        return {"$text": text_id}
+
+    def _build_dictionary(self) -> bytes:
+        """Packs the most used texts into a zlib dictionary (most used last, where zlib finds them cheapest)."""
+        chosen = []
+        size = 0
+        for text_id, _ in self._uses.most_common():
+            encoded = self._texts[text_id].encode('utf-8')
+            if size + len(encoded) > _MAX_DICTIONARY_SIZE:
+                break
+            chosen.append(encoded)
+            size += len(encoded)
+        return b"".join(reversed(chosen))
+
+    def to_dict(self) -> dict:
+        """Compresses the stored texts into their serializable form."""
+        dictionary = self._build_dictionary()
+        blocks = []
+        for start in range(0, len(self._texts), self.block_size):
+            compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+            # A JSON array keeps the boundaries of any text, whatever characters it contains
+            raw = json.dumps(self._texts[start:start + self.block_size], ensure_ascii=False).encode('utf-8')
+            blocks.append(base64.b64encode(compressor.compress(raw) + compressor.flush()).decode('ascii'))
+
+        return {
+            "block_size": self.block_size,
+            "count": len(self._texts),
+            "dictionary": base64.b64encode(dictionary).decode('ascii'),
+            "blocks": blocks
+        }
+
+
+def pack_world_text(world: Dict[str, Any], block_size: int = 64, trees_only: bool = False) -> Dict[str, Any]:
+    """
+    Moves the prose of a world into a text store.
+
+    The input is not modified (to_dict() results share objects with the GameData).
+
+    Args:
+        world: The world in its JSON form (as produced by GameData.to_dict()).
+        block_size: Number of texts compressed together in one block.
+        trees_only: Only move the text of dialogue trees, leaving other prose inline.
+
+    Returns:
+        A new world dictionary with text references and a "text_store" entry
+        (the world itself if trees_only is set and it has no dialogue trees).
+    """
+    if trees_only and not any(event['event_type'] == 'dialogue_tree' for event in world['events'].values()):
+        return world
+
+    store = TextStore(block_size)
+
+    def pack_items(items: list) -> list:
+        return [{**item, "description": store.add(item['description'])} for item in items]
+
+    rooms = world['rooms']
+    if not trees_only:
+        rooms = {}
+        for room_id, room in world['rooms'].items():
+            rooms[room_id] = {**room, "description": store.add(room['description']), "items": pack_items(room['items'])}
+
+    events = {}
+    for event_id, event in world['events'].items():
+        if trees_only and event['event_type'] != 'dialogue_tree':
+            events[event_id] = event
+            continue
+        data = dict(event['data'])
+        if event['event_type'] == 'dialogue':
+            data['lines'] = [store.add(line) for line in data.get('lines', [])]
+        elif event['event_type'] == 'read' and 'text' in data:
+            data['text'] = store.add(data['text'])
+        elif event['event_type'] == 'chest':
+            data['items'] = pack_items(data.get('items', []))
+        elif event['event_type'] == 'dialogue_tree':
+            # Large trees are where lazy text pays off most: only visited nodes get decompressed
+            data['text'] = [store.add(text) for text in data['text']]
+            data['choice_labels'] = [store.add(label) for label in data['choice_labels']]
+        events[event_id] = {**event, "data": data}
+
+    return {**world, "rooms": rooms, "events": events, "text_store": store.to_dict()}
+
+
+class TextRef:
+    """A piece of prose that is decompressed only when it is displayed."""
+    __slots__ = ('reader', 'text_id')
+
+    def __init__(self, reader: 'TextReader', text_id: int):
+        self.reader = reader
+        self.text_id = text_id
+
+    def __str__(self) -> str:
+        return self.reader.get(self.text_id)
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __repr__(self) -> str:
+        return f"TextRef({self.text_id})"
+
+
+class TextReader:
+    """Resolves text references at runtime, keeping a small LRU cache of decompressed blocks."""
+    def __init__(self, cache_size: int = 16):
+        """
+        Initializes an empty reader (call load() once the text store is known).
+
+        Args:
+            cache_size: How many decompressed blocks to keep in memory.
+        """
+        self.cache_size = cache_size
+        self.block_size = 1
+        self.count = 0
+        self._dictionary = b""
+        self._blocks: List[bytes] = []
+        self._cache: OrderedDict = OrderedDict()
+        self._refs: Dict[int, TextRef] = {}
+
+    def load(self, store: Dict[str, Any]):
+        """Loads the serialized text store (as produced by TextStore.to_dict())."""
+        self.block_size = store['block_size']
+        self._dictionary = base64.b64decode(store['dictionary'])
+        self._blocks = [base64.b64decode(block) for block in store['blocks']]
+        self.count = store.get('count', len(self._blocks) * self.block_size)
+        self._cache.clear()
+
+    def ref(self, text_id: int) -> TextRef:
+        """Returns the (shared) reference object for a text ID."""
+        text_ref = self._refs.get(text_id)
+        if text_ref is None:
+            text_ref = self._refs[text_id] = TextRef(self, text_id)
+        return text_ref
+
+    def referenced_ids(self) -> Set[int]:
+        """Returns the IDs of every reference created so far."""
+        return set(self._refs)
+
+    def object_hook(self, obj: dict):
+        """json.load hook turning {"$text": id} objects into TextRefs (other objects are returned as they are)."""
+        if len(obj) == 1 and "$text" in obj and type(obj["$text"]) is int:
+            return self.ref(obj["$text"])
+        return obj
+
+    def get(self, text_id: int) -> str:
+        """Returns the text for an ID, decompressing its block if needed."""
+        block_id, position = divmod(text_id, self.block_size)
+        texts = self._cache.get(block_id)
+        if texts is None:
+            decompressor = zlib.decompressobj(zdict=self._dictionary) if self._dictionary else zlib.decompressobj()
+            raw = decompressor.decompress(self._blocks[block_id]) + decompressor.flush()
+            texts = json.loads(raw.decode('utf-8'))
+            self._cache[block_id] = texts
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(block_id)
+        return texts[position]
@@ -14,8 +14,6 @@ radura = Room(
 # add exits
 radura.add_exit("nord", "LOC2")
 radura.add_exit("est", "LOC3")
-radura.add_exit("sud", "LOC4")
-radura.add_exit("ovest", "LOC5")
 
 # Add location to game data
 game_data.add_room(radura)